@@ -2,8 +2,8 @@ import logging
 import time
 import traceback
 import threading
+import numpy as np
 from PIL import Image as PImage
-from PIL import ImageOps
 
 tk_import = True
 try:
@@ -23,6 +23,14 @@ except:
     traceback.print_exc()
     hardware_import = False
 
+gpiod_import = True
+try:
+    import gpiod
+    from gpiod.line import Bias, Direction, Value
+except:
+    print("gpiod import failed, falling back to RPi.GPIO")
+    gpiod_import = False
+
 
 class Screen:
     """
@@ -42,9 +50,18 @@ class Screen:
         self._sleep = False
         self.width = 240
         self.height = 320
-        self.image = PImage.new("RGB", (240, 320), "black")
-        self._image_buffer = PImage.new("RGB", (240, 320), "black")
-        
+        # Content is pre-flipped at load time to match the panel orientation,
+        # the simulator always shows the unflipped image
+        self.flip_horizontal = config["screen_flip_horizontal"] and not simulate
+        self.flip_vertical = config["screen_flip_vertical"] and not simulate
+        # Ping-pong buffers, the app draws into frames[write_idx] and update()
+        # publishes it by flipping the index. The index flip is a single int
+        # assignment which is atomic under the GIL, so the single-reader
+        # thread needs no lock. The buffers are numpy arrays so the renderer
+        # can composite with writable slice assignments
+        self._frames = [np.zeros((320, 240, 3), dtype=np.uint8), np.zeros((320, 240, 3), dtype=np.uint8)]
+        self._write_idx = 0
+
         if simulate:
             assert tk_import, "Tkinter import has failed, cannot init"
             logging.debug("Initilizing screen simulator window")
@@ -53,6 +70,9 @@ class Screen:
 
             self.tk_label = Label(self.tk_root)
             self.tk_label.pack(fill=BOTH)
+            # Single PhotoImage reused every frame, updated in-place in update()
+            self._tk_photo = PImageTk.PhotoImage(PImage.fromarray(self.buffer), master=self.tk_root)
+            self.tk_label.config(image=self._tk_photo)
         else:
             assert hardware_import, "Hardware import has failed, cannot init"
 
@@ -60,6 +80,16 @@ class Screen:
             self.screen.Init()
             self.screen.clear()
     
+    @property
+    def buffer(self) -> np.ndarray:
+        """ The frame buffer array the application should draw into """
+        return self._frames[self._write_idx]
+
+    @property
+    def double_buffered(self) -> bool:
+        """ True when the render thread is consuming published frames """
+        return self.__thread is not None
+
     def set_sleep(self, is_sleep:bool):
         """ Turns the display off and stops rendering (sleep mode)
         
@@ -85,34 +115,30 @@ class Screen:
 
     def __thread_updator(self):
         """ Entry point for thread updator """
-        next_frame = time.time()
+        next_frame = time.monotonic()
         print("UPDATOR THREAD START")
         while self.__thread_run:
             self.update(True)
-            time.sleep(max(next_frame - time.time(), 0))
-            next_frame = time.time() + (1/self._config["screen_refresh"])
+            now = time.monotonic()
+            time.sleep(max(next_frame - now, 0))
+            next_frame = time.monotonic() + (1/self._config["screen_refresh"])
         print("UPDATOR THREAD END")
     
     def update(self, is_thread=False):
         """ Refreshed the display """
         if self.__thread and not is_thread:
-            self._image_buffer.paste(self.image)
+            self._write_idx ^= 1  # Publish the drawn frame to the reader thread
             return
-        
+
         if self._is_simulated:
-            self.tk_label.img = PImageTk.PhotoImage(self.image, master=self.tk_root)
-            self.tk_label.config(image=self.tk_label.img)
-            self.tk_label.update()
+            # The label redraw is handled by the Tk mainloop driving the app
+            self._tk_photo.paste(PImage.fromarray(self.buffer))
         elif not self._sleep:
             if is_thread:
-                image = self._image_buffer
+                buffer = self._frames[self._write_idx ^ 1]
             else:
-                image = self.image
-            if self._config["screen_flip_horizontal"]:
-                image = ImageOps.mirror(image)
-            if self._config["screen_flip_vertical"]:
-                image = ImageOps.flip(image)
-            self.screen.ShowImage(image)
+                buffer = self.buffer
+            self.screen.ShowImage(buffer)
     
     def teardown(self):
         """ Tears down the screen interface """
@@ -156,8 +182,20 @@ class GPHardware:
             self.button_obj.bind("<ButtonRelease-1>", self.__tk_but_off)
             self.button_obj.pack(side=TOP, anchor=W)
             self.button_state = False
+        elif gpiod_import:
+            # Request all lines once up front, each set/get is then a single
+            # ioctl on the cached request rather than a full RPi.GPIO call
+            self._lines = gpiod.request_lines(
+                "/dev/gpiochip0",
+                consumer="toolgun",
+                config={
+                    self.config["switch_pin"]: gpiod.LineSettings(direction=Direction.INPUT, bias=Bias.PULL_UP),
+                    self.config["led_pin"]: gpiod.LineSettings(direction=Direction.OUTPUT, output_value=Value.INACTIVE),
+                    self.config["motor_pin"]: gpiod.LineSettings(direction=Direction.OUTPUT, output_value=Value.INACTIVE),
+                }
+            )
         else:
-            assert hardware_import, "Hardware import has failed, cannot init"
+            assert hardware_import, "Hardware and gpiod imports have failed, cannot init"
             GPIO.setmode(GPIO.BCM)
             GPIO.setup(self.config["switch_pin"], GPIO.IN, pull_up_down=GPIO.PUD_UP)
             GPIO.setup(self.config["led_pin"], GPIO.OUT)
@@ -179,6 +217,8 @@ class GPHardware:
         """
         if self._simulated:
             self.led_state.config(text=f"LED: {'On' if is_on else 'Off'}", fg="green" if is_on else "red")
+        elif gpiod_import:
+            self._lines.set_value(self.config["led_pin"], Value.ACTIVE if is_on else Value.INACTIVE)
         else:
             GPIO.output(self.config["led_pin"], GPIO.HIGH if is_on else GPIO.LOW)
     
@@ -190,18 +230,20 @@ class GPHardware:
         """
         if self._simulated:
             self.motor_state.config(text=f"MOTOR: {'On' if is_on else 'Off'}", fg="green" if is_on else "red")
+        elif gpiod_import:
+            self._lines.set_value(self.config["motor_pin"], Value.ACTIVE if is_on else Value.INACTIVE)
         else:
             GPIO.output(self.config["motor_pin"], GPIO.HIGH if is_on else GPIO.LOW)
     
     def spin_motor(self):
         """ Spins the motor for a brief period """
         self.set_motor(True)
-        self._motor_spin_end = time.time() + self.config["spin_duration"]
-    
+        self._motor_spin_end = time.monotonic() + self.config["spin_duration"]
+
     def flash_led(self):
         """ Flashed the led for a brief period """
         self.set_led(True)
-        self._led_flash_end = time.time() + self.config["flash_duration"]
+        self._led_flash_end = time.monotonic() + self.config["flash_duration"]
     
     def is_trigger_down(self) -> bool:
         """ Checks if the trigger is currently down
@@ -211,29 +253,37 @@ class GPHardware:
         """
         if self._simulated:
             return self.button_state
+        elif gpiod_import:
+            pressed = self._lines.get_value(self.config["switch_pin"]) == Value.ACTIVE
+            if self.config["invert_button"]:
+                return not pressed
+            return pressed
         else:
             if self.config["invert_button"]:
                 return not GPIO.input(self.config["switch_pin"])
             return GPIO.input(self.config["switch_pin"])
     
-    def update(self):
-        """ Refreshed the display """
-        if self._motor_spin_end is not None and time.time() > self._motor_spin_end:
+    def update(self, now:float):
+        """ Refreshed the display
+
+        Args:
+            now: The current monotonic time for this tick
+        """
+        if self._motor_spin_end is not None and now > self._motor_spin_end:
             self._motor_spin_end = None
             self.set_motor(False)
 
-        if self._led_flash_end is not None and time.time() > self._led_flash_end:
+        if self._led_flash_end is not None and now > self._led_flash_end:
             self._led_flash_end = None
             self.set_led(False)
-        
-        if self._simulated:
-            self.tk_root.update()
     
     def teardown(self):
         """ Tears down the screen interface """
         logging.debug("Tearing down screen interface")
         if self._simulated:
             self.tk_root.destroy()
+        elif gpiod_import:
+            self._lines.release()
         else:
             self.screen.module_exit()
             GPIO.cleanup()
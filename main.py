@@ -4,6 +4,8 @@ import logging
 import time
 import simpleaudio
 import random
+import wave
+import numpy as np
 from PIL import Image, ImageFont, ImageDraw
 import os
 
@@ -11,6 +13,13 @@ from simpleaudio.shiny import play_buffer
 
 import hardware
 
+numba_import = True
+try:
+    import numba
+except:
+    print("Numba import failed, JIT render kernel disabled")
+    numba_import = False
+
 def content_relative(filename:str) -> str:
     """ Returns a full path from a relative filename within the content folder
     
@@ -22,11 +31,47 @@ def content_relative(filename:str) -> str:
     current_dir = os.path.abspath(os.path.dirname(__file__))
     return os.path.join(current_dir, "content", filename)
 
+def _compose_text_row(buffer, strip, sprite, mask, strip_y, text_x, ghost_x):
+    """ Fills the text row of the frame buffer in a single pass, restoring the
+    background strip and overlaying the text sprite (and its ghost) where the
+    coverage mask is set. JIT compiled when Numba is available
+
+    Args:
+        buffer: The full frame buffer array
+        strip: The background crop covering the text row
+        sprite: The RGB text sprite to overlay
+        mask: The boolean coverage mask of the sprite
+        strip_y: The first buffer row of the text strip
+        text_x: The x position of the text sprite
+        ghost_x: The x position of the ghost copy, off screen when not shown
+    """
+    height, width = strip.shape[0], strip.shape[1]
+    sprite_width = sprite.shape[1]
+    for y in range(height):
+        for x in range(width):
+            sx = x - text_x
+            if sx < 0 or sx >= sprite_width or not mask[y, sx]:
+                sx = x - ghost_x
+                if sx < 0 or sx >= sprite_width or not mask[y, sx]:
+                    sx = -1
+            if sx >= 0:
+                buffer[strip_y + y, x, 0] = sprite[y, sx, 0]
+                buffer[strip_y + y, x, 1] = sprite[y, sx, 1]
+                buffer[strip_y + y, x, 2] = sprite[y, sx, 2]
+            else:
+                buffer[strip_y + y, x, 0] = strip[y, x, 0]
+                buffer[strip_y + y, x, 1] = strip[y, x, 1]
+                buffer[strip_y + y, x, 2] = strip[y, x, 2]
+
+if numba_import:
+    _compose_text_row = numba.njit(cache=True)(_compose_text_row)
+
 class Tool:
     """
       Represents a single tool for the toolgun
     """
     YELLOW_FADE_TIME = 0.5
+    FADE_STEPS = 8  # Number of pre-blended frames used for the yellow fade
 
     def __init__(self, app, config:dict) -> None:
         """ Creates an instance of Tool
@@ -39,9 +84,10 @@ class Tool:
         self.config = config
         self._text_y = app.config["text_scroll_y"]
         self._description = None
+        self._description_cache = []
         self._playbacks = []
         self._init_timer = None  # Timer used to apply a fade effect to the text
-        self._replay_timer = time.time()
+        self._replay_timer = time.monotonic()
 
         self.name = self.config["name"]
         self.hold = config["hold"] if "hold" in config else False
@@ -63,10 +109,13 @@ class Tool:
     def reset(self):
         """ Resets all visual attributes of the tool """
         self._description_selector = 0
-        if self.descriptions:
-            self._update_description(self.descriptions[0])
+        self._description = self._description_cache[0] if self._description_cache else None
+        self._description_changed = True
+        self._last_x_pos = None
+        self._full_repaint = True
+        self._desc_restore = False
         self._sound_selector = 0
-        self._init_timer = time.time()
+        self._init_timer = time.monotonic()
         self._stop_playbacks()
     
     def _stop_playbacks(self):
@@ -85,31 +134,110 @@ class Tool:
         logging.debug(f"Loading all tool content for tool {self.name}")
 
         # Title text cache render
+        # Rasterize the glyphs once into a coverage mask, the shadow and both
+        # colour variants are then just fills pasted through that mask
         text = self.name
         font_size = self._app.font.getsize(text)
-
-        self._text_cache = Image.new("RGBA", (font_size[0]+5, font_size[1]+5), (0, 0, 0, 0))
-        self._text_cache_yellow = Image.new("RGBA", (font_size[0]+5, font_size[1]+5), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(self._text_cache)
-        draw_yellow = ImageDraw.Draw(self._text_cache_yellow)
-        draw.text((4, 4), text, font=self._app.font, fill=(0, 0, 0))
-        draw.text((0, 0), text, font=self._app.font, fill=(255, 255, 255))
-        draw_yellow.text((4, 4), text, font=self._app.font, fill=(0, 0, 0))
-        draw_yellow.text((0, 0), text, font=self._app.font, fill=(255, 205, 0))
-
-        self._background = Image.open(content_relative(self.background))
-
-        # Load all sounds used
+        cache_size = (font_size[0]+5, font_size[1]+5)
+
+        text_mask = Image.new("L", cache_size, 0)
+        ImageDraw.Draw(text_mask).text((0, 0), text, font=self._app.font, fill=255)
+
+        text_cache = Image.new("RGBA", cache_size, (0, 0, 0, 0))
+        text_cache_yellow = Image.new("RGBA", cache_size, (0, 0, 0, 0))
+        text_cache.paste((0, 0, 0, 255), (4, 4), text_mask)
+        text_cache.paste((255, 255, 255, 255), (0, 0), text_mask)
+        text_cache_yellow.paste((0, 0, 0, 255), (4, 4), text_mask)
+        text_cache_yellow.paste((255, 205, 0, 255), (0, 0), text_mask)
+        text_cache = self._apply_screen_flip(text_cache)
+        text_cache_yellow = self._apply_screen_flip(text_cache_yellow)
+        self._scroll_period = text_cache.size[0] + (self._app.screen.width//2)
+
+        # The sprites are kept as RGB arrays plus one shared boolean mask so
+        # render can composite them with plain numpy slice assignments,
+        # the yellow fade is pre-blended so render never calls Image.blend
+        self._fade_frames = []
+        for i in range(self.FADE_STEPS):
+            self._fade_frames.append(np.asarray(Image.blend(text_cache_yellow, text_cache, i/self.FADE_STEPS).convert("RGB")))
+        self._text_sprite = np.asarray(text_cache.convert("RGB"))
+        self._text_mask = np.asarray(text_cache)[:, :, 3] > 0
+
+        self._background = np.asarray(self._apply_screen_flip(Image.open(content_relative(self.background)).convert("RGB")))
+
+        # Only the text row and the description bar change between frames, so
+        # cache those background regions (in pre-flipped screen space) and
+        # restore just them instead of repasting the whole background
+        screen = self._app.screen
+        text_height = self._text_sprite.shape[0]
+        strip_y = screen.height - text_height - self._text_y if screen.flip_vertical else self._text_y
+        self._text_strip_box = (0, strip_y, screen.width, strip_y + text_height)
+        self._bg_text_strip = self._background[strip_y:strip_y + text_height]
+
+        desc_size = (screen.width-20, 30)
+        desc_pos = self._paste_pos(screen, 10, 73, desc_size)
+        self._desc_box = (desc_pos[0], desc_pos[1], desc_pos[0] + desc_size[0], desc_pos[1] + desc_size[1])
+        self._bg_desc_strip = self._background[self._desc_box[1]:self._desc_box[3], self._desc_box[0]:self._desc_box[2]]
+
+        # Descriptions are fixed config so pre-render them all now, trigger
+        # then only has to pick an index
+        for description in self.descriptions:
+            self._description_cache.append(self._render_description(description))
+        self._description = self._description_cache[0] if self._description_cache else None
+
+        # Load all sounds used, decoded once to raw PCM so each play is just a
+        # buffer handoff with no per-play parsing
         self._sounds = []
         for sound in self.sounds:
             if sound.endswith(".wav"):
-                self._sounds.append(simpleaudio.WaveObject.from_wave_file(content_relative(sound)))
+                with wave.open(content_relative(sound), "rb") as wave_file:
+                    self._sounds.append((
+                        wave_file.readframes(wave_file.getnframes()),
+                        wave_file.getnchannels(),
+                        wave_file.getsampwidth(),
+                        wave_file.getframerate()
+                    ))
             else:
                 raise Exception(f"Only wave files are supported ({sound})")
 
+        # Pre-shuffled play order for random mode, advancing an index replaces
+        # the per-trigger RNG call and avoids immediate repeats
+        self._shuffled_sounds = list(range(len(self._sounds)))
+        random.shuffle(self._shuffled_sounds)
+        self._shuffle_index = 0
+
         self._loaded = True
+
+        # Bake the screen width and scroll period into a specialized render
+        # driver as literals, the generic render stays as the fallback
+        try:
+            namespace = {}
+            exec(self._RENDER_TEMPLATE.format(width=self._app.screen.width, period=self._scroll_period), globals(), namespace)
+            self.render = namespace["render"].__get__(self)
+        except Exception:
+            logging.exception(f"Failed to specialize render for tool {self.name}")
+
         logging.debug(f"Loaded all tool content")
     
+    def sound_bytes(self) -> int:
+        """ Returns the total number of PCM bytes across this tools sounds """
+        return sum(len(sound[0]) for sound in self._sounds)
+
+    def repack_sounds(self, pool:memoryview, offset:int) -> int:
+        """ Moves this tools PCM data into a shared pool buffer
+
+        Args:
+            pool: A view of the shared sound pool to pack into
+            offset: The offset within the pool to start packing at
+        Returns:
+            int: The offset after this tools sounds
+        """
+        for i, (audio_data, channels, sample_width, framerate) in enumerate(self._sounds):
+            end = offset + len(audio_data)
+            pool[offset:end] = audio_data
+            self._sounds[i] = (pool[offset:end], channels, sample_width, framerate)
+            offset = end
+        return offset
+
     def _play_sound(self):
         """ Plays the tools sound """
         sound = None
@@ -117,53 +245,89 @@ class Tool:
             self._sound_selector = (self._sound_selector+1)%len(self.sounds)
             sound = self._sounds[self._sound_selector]
         elif self.sound_order == "random":
-            sound = random.choice(self._sounds)
+            sound = self._sounds[self._shuffled_sounds[self._shuffle_index]]
+            self._shuffle_index += 1
+            if self._shuffle_index == len(self._shuffled_sounds):
+                random.shuffle(self._shuffled_sounds)
+                self._shuffle_index = 0
         
         if sound:
             if not self.sound_overlap:
                 self._stop_playbacks()
-            self._playbacks.append(sound.play())
-            self._replay_timer = time.time() + self.sound_replay
+            audio_data, channels, sample_width, framerate = sound
+            self._playbacks.append(play_buffer(audio_data, channels, sample_width, framerate))
+            self._replay_timer = time.monotonic() + self.sound_replay
     
-    def _update_description(self, text:str):
-        """ Displays description on the toolgun
-        Passing None will hide the text
-        
+    def _apply_screen_flip(self, image:Image.Image) -> Image.Image:
+        """ Pre-flips content once to match the screen orientation
+
+        Args:
+            image: The image to transform
+        Returns:
+            Image: The image flipped to match the screen
+        """
+        if self._app.screen.flip_horizontal:
+            image = image.transpose(Image.FLIP_LEFT_RIGHT)
+        if self._app.screen.flip_vertical:
+            image = image.transpose(Image.FLIP_TOP_BOTTOM)
+        return image
+
+    def _paste_pos(self, screen:"hardware.Screen", x:int, y:int, size:tuple) -> tuple:
+        """ Converts an unflipped paste position into the screen's pre-flipped space
+
+        Args:
+            screen: The screen being rendered to
+            x: The x position on the unflipped screen
+            y: The y position on the unflipped screen
+            size: The (width, height) of the image being pasted
+        Returns:
+            tuple: The equivalent (x, y) position on the pre-flipped screen
+        """
+        if screen.flip_horizontal:
+            x = screen.width - size[0] - x
+        if screen.flip_vertical:
+            y = screen.height - size[1] - y
+        return (x, y)
+
+    def _render_description(self, text:str) -> np.ndarray:
+        """ Renders a description image for the toolgun
+        Passing None will return None (no description shown)
+
         Args:
             text: The text to place on the toolgun
+        Returns:
+            ndarray: The rendered description as an RGB array, or None for no description
         """
         if text is None:
-            self._description = None
-        else:  # Render new description
-            width = self._app.screen.width-20
-            text_width = self._app.arial_font.getsize_multiline(text)[0]
-
-            self._description = Image.new("RGB", (width, 30), (238, 240, 200))
-            draw = ImageDraw.Draw(self._description)
-            draw.line((0, 29, width, 29), fill=(0, 0, 0), width=4)
-            draw.line((width-1, 0, width-1, 29), fill=(0, 0, 0), width=4)
-            if "\n" in text:
-                pos = 0
-            else:
-                pos = 7
-            draw.text(((width//2) - (text_width//2), pos), text, (0, 0, 0), self._app.arial_font, align="center")
+            return None
+        width = self._app.screen.width-20
+        text_width = self._app.arial_font.getsize_multiline(text)[0]
+
+        description = Image.new("RGB", (width, 30), (238, 240, 200))
+        draw = ImageDraw.Draw(description)
+        draw.line((0, 29, width, 29), fill=(0, 0, 0), width=4)
+        draw.line((width-1, 0, width-1, 29), fill=(0, 0, 0), width=4)
+        if "\n" in text:
+            pos = 0
+        else:
+            pos = 7
+        draw.text(((width//2) - (text_width//2), pos), text, (0, 0, 0), self._app.arial_font, align="center")
+        return np.asarray(self._apply_screen_flip(description))
+
 
-    
     def _manage_playbacks(self):
         """ Removes any finished playbacks """
-        removes = []
-        for playback in self._playbacks:
-            if not playback.is_playing():
-                removes.append(playback)
-        for playback in removes:
-            self._playbacks.remove(playback)
+        self._playbacks = [playback for playback in self._playbacks if playback.is_playing()]
 
     def trigger(self):
         """ Called when the user fires the gun """
         # Tool description updates
         if self.descriptions:
             self._description_selector = (self._description_selector+1) % len(self.descriptions)
-            self._update_description(self.descriptions[self._description_selector])
+            self._description = self._description_cache[self._description_selector]
+            self._description_changed = True
+            if self._description is None:  # Background needs restoring under it
+                self._desc_restore = True
         
         # Play toolgun sounds
         if self.sounds:
@@ -178,9 +342,13 @@ class Tool:
         if self.motor_spin:
             self._app.hardware.spin_motor()
     
-    def loop(self):
-        """ Called when the this tool has holding enabled """
-        if self.sound_replay != 0 and time.time() > self._replay_timer and self.sounds:
+    def loop(self, now:float):
+        """ Called when the this tool has holding enabled
+
+        Args:
+            now: The current monotonic time for this tick
+        """
+        if self.sound_replay != 0 and now > self._replay_timer and self.sounds:
             self._play_sound()
         
         if self.light_up:
@@ -191,35 +359,118 @@ class Tool:
         
         self._manage_playbacks()
     
-    def render(self, screen:hardware.Screen):
+    def _blit_text(self, buffer:np.ndarray, sprite:np.ndarray, x:int, y:int):
+        """ Blits a text sprite into the frame buffer through the text mask
+
+        Args:
+            buffer: The frame buffer array to draw into
+            sprite: The RGB sprite array to draw
+            x: The x position in the buffer, may be partially off screen
+            y: The y position in the buffer
+        """
+        height, width = sprite.shape[:2]
+        x_start = max(x, 0)
+        x_end = min(x + width, buffer.shape[1])
+        if x_end <= x_start:
+            return
+        sprite_cols = slice(x_start - x, x_end - x)
+        mask = self._text_mask[:, sprite_cols]
+        region = buffer[y:y+height, x_start:x_end]
+        region[mask] = sprite[:, sprite_cols][mask]
+
+    # Per-frame driver specialized at load time with the screen and scroll
+    # constants folded in as literals, see load_content
+    _RENDER_TEMPLATE = (
+        "def render(self, screen:hardware.Screen, now:float) -> bool:\n"
+        "    x_pos = {width} - int((now*160)%{period})\n"
+        "    if x_pos == self._last_x_pos and self._init_timer is None and not self._description_changed:\n"
+        "        return False\n"
+        "    self._last_x_pos = x_pos\n"
+        "    self._description_changed = False\n"
+        "    self._compose(screen, x_pos, now)\n"
+        "    return True\n"
+    )
+
+    def render(self, screen:hardware.Screen, now:float) -> bool:
         """ Renders the tool to the screen
-        
+
         Args:
             screen: The screen to render to
+            now: The current monotonic time for this tick
+        Returns:
+            bool: True if anything changed and the screen needs pushing
         """
         assert self._loaded, "Tool content has not been loaded!!"
 
-        screen.image.paste(self._background)
+        x_pos = screen.width - int((now*160)%self._scroll_period)
+
+        # Nothing moved or faded since the last frame, skip the redraw entirely
+        if x_pos == self._last_x_pos and self._init_timer is None and not self._description_changed:
+            return False
+        self._last_x_pos = x_pos
+        self._description_changed = False
+        self._compose(screen, x_pos, now)
+        return True
+
+    def _compose(self, screen:hardware.Screen, x_pos:int, now:float):
+        """ Draws the frame for the given text position into the screen buffer
 
-        # Draw moving text
-        x_pos = screen.width - int((time.time()*160)%(self._text_cache.size[0]+(screen.width//2)))
+        Args:
+            screen: The screen to render to
+            x_pos: The x position of the scrolling text this frame
+            now: The current monotonic time for this tick
+        """
+        # Constants hoisted to locals as this runs every frame
+        sprite = self._text_sprite
+        text_size = (sprite.shape[1], sprite.shape[0])
+        text_y = self._text_y
+        buffer = screen.buffer
+
+        # Double buffered frames do not hold the previous frame, so partial
+        # restores only apply when rendering straight into the screen buffer
+        if self._full_repaint or screen.double_buffered:
+            buffer[:] = self._background
+            self._full_repaint = False
+            self._desc_restore = False
+        else:
+            if not numba_import:  # The JIT kernel restores the text strip itself
+                buffer[self._text_strip_box[1]:self._text_strip_box[3]] = self._bg_text_strip
+            if self._desc_restore:
+                buffer[self._desc_box[1]:self._desc_box[3], self._desc_box[0]:self._desc_box[2]] = self._bg_desc_strip
+                self._desc_restore = False
 
         if self._init_timer is not None:
-            render_text = Image.blend(self._text_cache_yellow, self._text_cache, min((time.time() - self._init_timer)/self.YELLOW_FADE_TIME, 1))
-            if time.time() > self._init_timer + self.YELLOW_FADE_TIME:
+            if now > self._init_timer + self.YELLOW_FADE_TIME:
                 self._init_timer = None
+                render_text = sprite
+            else:
+                frame = int((now - self._init_timer)/self.YELLOW_FADE_TIME*self.FADE_STEPS)
+                render_text = self._fade_frames[min(frame, self.FADE_STEPS-1)]
+        else:
+            render_text = sprite
+
+        ghost_visible = x_pos > screen.width//2
+        text_x = self._paste_pos(screen, x_pos, text_y, text_size)[0]
+        ghost_x = self._paste_pos(screen, x_pos-self._scroll_period, text_y, text_size)[0] if ghost_visible else -text_size[0]
+        strip_y = self._text_strip_box[1]
+        if numba_import:
+            _compose_text_row(buffer, self._bg_text_strip, render_text, self._text_mask, strip_y, text_x, ghost_x)
         else:
-            render_text = self._text_cache
-        screen.image.paste(render_text, (x_pos, self._text_y), mask=self._text_cache)
-        if x_pos-self._text_cache.size[0]-(screen.width//2)+self._text_cache.size[0] > 0:  # Render ghost
-            screen.image.paste(render_text, (x_pos-self._text_cache.size[0]-(screen.width//2), self._text_y), mask=self._text_cache)
+            self._blit_text(buffer, render_text, text_x, strip_y)
+            if ghost_visible:
+                self._blit_text(buffer, render_text, ghost_x, strip_y)
 
         if self._description is not None:
-            screen.image.paste(self._description, (10, 73))
+            buffer[self._desc_box[1]:self._desc_box[3], self._desc_box[0]:self._desc_box[2]] = self._description
 
     def unload_content(self):
         """ Unloads all the content within this tool """
-        self._text_cache = None
+        if "render" in self.__dict__:  # Remove the specialized render driver
+            del self.__dict__["render"]
+        self._text_sprite = None
+        self._text_mask = None
+        self._fade_frames = None
+        self._description_cache.clear()
         self._sounds.clear()
         self._loaded = False
 
@@ -246,7 +497,8 @@ class App:
         self._was_changing_tool = False  # Used to signify the tool was changed (plays sound)
         self._last_trigger = 0  # Used to time when the last trigger was (useful in switching from hold tools)
         self._sleep_mode = False
-        self._sleep_timer = time.time() + config["sleep_timeout"]
+        self._sleep_timer = time.monotonic() + config["sleep_timeout"]
+        self._tick_interval = int(1000/config["refresh_rate"])  # In milliseconds, for Tk scheduling
 
         # Default content
         self.font = ImageFont.truetype(content_relative(config["font"]), config["font_size"])
@@ -269,10 +521,43 @@ class App:
             self.tools.append(Tool(self, tool))
             if i < self.MAX_TOOLS:
                 self.tools[-1].load_content()
+
+        if numba_import and self.tools:
+            # Warm up the JIT compile so the first real frame is not slow
+            logging.debug("Warming up render kernel")
+            self.tools[0].render(self.screen, time.monotonic())
+            self.tools[0].reset()
+
+        self._build_sound_pool()
+
+    def _build_sound_pool(self):
+        """ Packs every loaded tool sound into one contiguous resident buffer
+        Playback hands out zero-copy views into the pool, and every page is
+        touched up front so the first trigger never stalls on a page fault
+        """
+        loaded_tools = [tool for tool in self.tools if tool.is_loaded()]
+        total = sum(tool.sound_bytes() for tool in loaded_tools)
+        logging.debug(f"Packing {total} bytes of sound data into the pool")
+
+        self._sound_pool = bytearray(total)
+        pool = memoryview(self._sound_pool)
+        offset = 0
+        for tool in loaded_tools:
+            offset = tool.repack_sounds(pool, offset)
+
+        for i in range(0, total, 4096):  # Touch every page to make it resident
+            _ = self._sound_pool[i]
     
     def play_startup(self):
         """ Plays the startup sound """
         self._startup_sound.play()
+
+    def schedule_update(self):
+        """ Performs one update tick and schedules the next via the Tk event loop
+        Only used in simulated mode where Tk's mainloop drives the application
+        """
+        self.update(time.monotonic())
+        self.screen.tk_root.after(self._tick_interval, self.schedule_update)
     
     def next_tool(self):
         """ Switches to the next tool and plays the switching audio """
@@ -283,24 +568,29 @@ class App:
         self._was_changing_tool = True
         self._next_item_sound.play()
     
-    def update(self):
-        """ Update method for a single update tick """
+    def update(self, now:float):
+        """ Update method for a single update tick
+
+        Args:
+            now: The current monotonic time for this tick
+        """
+        dirty = False
         if not self._sleep_mode:
-            self.tools[self._current_tool].render(self.screen)
+            dirty = self.tools[self._current_tool].render(self.screen, now)
 
         trigger_down = self.hardware.is_trigger_down()
         if trigger_down != self._button_change:
             self._button_change = trigger_down
             if self._button_change:
                 self.tools[self._current_tool].trigger()
-                self._trigger_hold = time.time()
+                self._trigger_hold = now
             else:
                 self._last_trigger, self._trigger_hold = self._trigger_hold, None
                 if self._was_changing_tool:
                     self._was_changing_tool = False
                     self._equip_item_sound.play()
             
-            self._sleep_timer = time.time() + self.config["sleep_timeout"]
+            self._sleep_timer = now + self.config["sleep_timeout"]
             if self._sleep_mode:
                 logging.info("Exiting sleep mode")
                 self._sleep_mode = False
@@ -309,25 +599,26 @@ class App:
                 self.screen.set_sleep(False)
             
         elif trigger_down and self.tools[self._current_tool].hold and not self._was_changing_tool:  # Holding tool
-            self.tools[self._current_tool].loop()
-            if time.time() - self._last_trigger < 0.5+self.config["tool_change_timeout"] and \
-                time.time() > self._trigger_hold+self.config["tool_change_timeout"]:
-                    self._trigger_hold = time.time()
+            self.tools[self._current_tool].loop(now)
+            if now - self._last_trigger < 0.5+self.config["tool_change_timeout"] and \
+                now > self._trigger_hold+self.config["tool_change_timeout"]:
+                    self._trigger_hold = now
                     self.next_tool()
 
-        elif trigger_down and self._trigger_hold is not None and time.time() > self._trigger_hold+self.config["tool_change_timeout"]:  # Next tool
-            self._trigger_hold = time.time()
+        elif trigger_down and self._trigger_hold is not None and now > self._trigger_hold+self.config["tool_change_timeout"]:  # Next tool
+            self._trigger_hold = now
             self.next_tool()
         
-        if time.time() > self._sleep_timer and not self._sleep_mode:
+        if now > self._sleep_timer and not self._sleep_mode:
             logging.info("No user input, entering sleep mode")
             self._sleep_mode = True
             if not self.screen._is_simulated:
                 self.screen.screen.bl_DutyCycle(0)
             self.screen.set_sleep(True)
 
-        self.hardware.update()
-        self.screen.update()
+        self.hardware.update(now)
+        if dirty:
+            self.screen.update()
     
     def teardown(self):
         """ Tears down the application """
@@ -361,16 +652,29 @@ def main():
 
     app.play_startup()
 
-    next_frame = time.time()
+    if args.simulate:
+        # Let Tk's own event loop drive the updates, calling tk update() from
+        # a sleep loop flushes the whole event queue every tick
+        app.schedule_update()
+        try:
+            app.screen.tk_root.mainloop()
+        except KeyboardInterrupt:
+            logging.debug("Recieved keyboard interrupt")
+        app.teardown()
+        return
+
+    next_frame = time.monotonic()
     while True:
         try:
-            app.update()
-            
-            if args.log_drop and next_frame - time.time() < 0:  # Log FPS drop
-                logging.warn(f"FPS drop!! lost {abs(next_frame - time.time())} secs")
+            now = time.monotonic()
+            app.update(now)
+
+            now = time.monotonic()
+            if args.log_drop and next_frame - now < 0:  # Log FPS drop
+                logging.warn(f"FPS drop!! lost {abs(next_frame - now)} secs")
 
-            time.sleep(max(next_frame - time.time(), 0))
-            next_frame = time.time() + (1/config["refresh_rate"])
+            time.sleep(max(next_frame - now, 0))
+            next_frame = time.monotonic() + (1/config["refresh_rate"])
         except KeyboardInterrupt:
             logging.debug("Recieved keyboard interrupt")
             app.teardown()
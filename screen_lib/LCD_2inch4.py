@@ -135,38 +135,22 @@ class LCD_2inch4(lcdconfig.RaspberryPi):
     def ShowImage(self,Image,Xstart=0,Ystart=0):
         """Set buffer to value of Python Imaging Library image."""
         """Write display buffer to physical display"""
-        imwidth, imheight = Image.size
+        img = self.np.asarray(Image, dtype = self.np.uint16)
+        imheight, imwidth = img.shape[0], img.shape[1]
+        #RGB888 >> RGB565, big endian as the panel expects
+        pix = ((img[...,0] & 0xF8) << 8) | ((img[...,1] & 0xFC) << 3) | (img[...,2] >> 3)
+        buf = pix.byteswap().tobytes()
+
+        self.command(0x36)
         if imwidth == self.height and imheight ==  self.width:
-            img = self.np.asarray(Image)
-            pix = self.np.zeros((self.width, self.height,2), dtype = self.np.uint8)
-            #RGB888 >> RGB565
-            pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-            pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0), self.np.right_shift(img[...,[2]],3))
-            pix = pix.flatten().tolist()
-            
-            self.command(0x36)
-            self.data(0x78) 
+            self.data(0x78)
             self.SetWindows ( 0, 0, self.height,self.width)
-            self.digital_write(self.DC_PIN,self.GPIO.HIGH)
-            for i in range(0,len(pix),4096):
-                self.spi_writebyte(pix[i:i+4096])
-            
         else :
-            img = self.np.asarray(Image)
-            pix = self.np.zeros((imheight,imwidth , 2), dtype = self.np.uint8)
-            
-            pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-            pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0), self.np.right_shift(img[...,[2]],3))
-
-            pix = pix.flatten().tolist()
-            
-            self.command(0x36)
-            self.data(0x08) 
+            self.data(0x08)
             self.SetWindows ( 0, 0, self.width, self.height)
-            self.digital_write(self.DC_PIN,self.GPIO.HIGH)
-            for i in range(0,len(pix),4096):
-                self.spi_writebyte(pix[i:i+4096])		
-                
+        self.digital_write(self.DC_PIN,self.GPIO.HIGH)
+        self.SPI.writebytes2(buf)
+
     def clear(self):
         """Clear contents of image buffer"""
         _buffer = [0xff]*(self.width * self.height * 2)